@@ -4,30 +4,530 @@ Convertisseur de playlists entre Spotify et Deezer
 Permet de transférer des playlists d'une plateforme à l'autre
 """
 
-import spotipy
-from spotipy.oauth2 import SpotifyOAuth
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 import time
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Set, Tuple
+from dataclasses import dataclass
+from functools import lru_cache
 import re
+import unicodedata
+import os
+import sys
+import argparse
+from rapidfuzz import process, fuzz, utils
 from urllib.parse import urlencode, urlparse, parse_qs
 import webbrowser
-import http.server
-import socketserver
+import asyncio
 import threading
+import shelve
+import sqlite3
+import atexit
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Complétion des noms de playlists (indisponible sur Windows)
+try:
+    import readline
+except ImportError:
+    readline = None
 
 # Import de la configuration
 try:
-    from config import (
-        SPOTIFY_CLIENT_ID, SPOTIFY_CLIENT_SECRET, SPOTIFY_REDIRECT_URI, SPOTIFY_SCOPE,
-        DEEZER_APP_ID, DEEZER_APP_SECRET, DEEZER_BASE_URL, DEEZER_AUTH_URL, DEEZER_TOKEN_URL
-    )
+    import config
 except ImportError:
     print("❌ Fichier config.py introuvable!")
     print("💡 Créez un fichier config.py avec vos identifiants d'application")
     exit(1)
 
+
+@dataclass(frozen=True)
+class AppConfig:
+    __slots__ = (
+        'spotify_client_id', 'spotify_client_secret', 'spotify_redirect_uri', 'spotify_scope',
+        'deezer_app_id', 'deezer_app_secret', 'deezer_base_url', 'deezer_auth_url', 'deezer_token_url'
+    )
+    
+    spotify_client_id: str
+    spotify_client_secret: str
+    spotify_redirect_uri: str
+    spotify_scope: str
+    deezer_app_id: str
+    deezer_app_secret: str
+    deezer_base_url: str
+    deezer_auth_url: str
+    deezer_token_url: str
+
+
+def _config_value(name: str, default: str = "") -> str:
+    """Valeur de configuration : variable d'environnement, puis config.py, puis défaut"""
+    return os.getenv(name, getattr(config, name, default))
+
+
+@lru_cache(maxsize=1)
+def load_config() -> AppConfig:
+    """Construit la configuration une seule fois à partir de config.py et de l'environnement"""
+    return AppConfig(
+        spotify_client_id=_config_value("SPOTIFY_CLIENT_ID"),
+        spotify_client_secret=_config_value("SPOTIFY_CLIENT_SECRET"),
+        spotify_redirect_uri=_config_value("SPOTIFY_REDIRECT_URI", "http://127.0.0.1:8080/callback"),
+        spotify_scope=_config_value(
+            "SPOTIFY_SCOPE", "playlist-read-private playlist-modify-public playlist-modify-private"
+        ),
+        deezer_app_id=_config_value("DEEZER_APP_ID"),
+        deezer_app_secret=_config_value("DEEZER_APP_SECRET"),
+        deezer_base_url=_config_value("DEEZER_BASE_URL", "https://api.deezer.com"),
+        deezer_auth_url=_config_value("DEEZER_AUTH_URL", "https://connect.deezer.com/oauth/auth.php"),
+        deezer_token_url=_config_value("DEEZER_TOKEN_URL", "https://connect.deezer.com/oauth/access_token.php"),
+    )
+
+
+# URLs publiques de l'API Deezer (les identifiants restent dans load_config())
+DEEZER_BASE_URL = load_config().deezer_base_url
+DEEZER_AUTH_URL = load_config().deezer_auth_url
+DEEZER_TOKEN_URL = load_config().deezer_token_url
+
+# Point d'entrée de l'API Web Spotify (pages de playlists lues sans spotipy)
+SPOTIFY_API_URL = "https://api.spotify.com/v1"
+
+# Caractères retirés des titres/artistes avant recherche
+_CLEAN_RE = re.compile(r'[^\w\s]', re.UNICODE)
+
+# URLs de playlists acceptées par l'option 3 (validées avant tout appel réseau)
+# Le groupe nommé qui correspond indique la plateforme (voir match_playlist_url)
+_URL_RE = re.compile(
+    r"^(?:(?:spotify:playlist:|https?://open\.spotify\.com/(?:intl-[a-z-]+/)?playlist/)(?P<spotify>[A-Za-z0-9]+)"
+    r"|https?://(?:www\.)?deezer\.com/(?:[a-z]{2}(?:-[a-z]{2})?/)?playlist/(?P<deezer>\d+)"
+    r"|(?P<deezer_short>https?://link\.deezer\.com/s/\w+))",
+    re.IGNORECASE
+)
+
+# Mention d'artiste invité dans un titre : "(feat. X)", "[ft. X]"
+_FEAT_RE = re.compile(r'\s*[\(\[](?:feat|ft)\.?\s[^\)\]]*[\)\]]', re.IGNORECASE)
+
+# Score minimal (0-100) pour considérer un résultat comme correspondant
+MATCH_SCORE_CUTOFF = 70
+
+# Taille maximale d'une page de morceaux (Spotify et Deezer)
+PAGE_SIZE = 100
+
+# Délai de lecture d'une requête sur le serveur de callback Deezer : les navigateurs
+# ouvrent parfois une connexion de préchargement qui n'envoie jamais rien
+CALLBACK_READ_TIMEOUT = 10
+
+# Page affichée dans le navigateur à la fin de l'authentification Deezer
+CALLBACK_SUCCESS_PAGE = b'''
+<html>
+    <body>
+        <h2>Authentification reussie!</h2>
+        <p>Vous pouvez fermer cette fenetre.</p>
+        <script>window.close();</script>
+    </body>
+</html>
+'''
+
+# Taille maximale d'une page de playlists Spotify
+PLAYLISTS_PAGE_SIZE = 50
+
+# Nombre de recherches lancées en parallèle pendant une conversion
+SEARCH_WORKERS = 10
+
+# Fréquence de rafraîchissement de la ligne de progression (en morceaux)
+PROGRESS_EVERY = 25
+
+# Nombre maximum de morceaux ajoutés à une playlist Deezer par requête : limite
+# empirique prudente, au-delà Deezer peut tronquer le paramètre "songs" sans erreur
+DEEZER_ADD_BATCH = 100
+
+# Délai maximal (secondes) pour résoudre un lien court Deezer
+SHORT_LINK_TIMEOUT = 5
+
+# Durée de conservation de la liste des playlists Spotify dans le menu (5 minutes)
+PLAYLISTS_CACHE_TTL = 300
+
+# Fichiers persistés entre les exécutions
+APP_DATA_DIR = os.path.expanduser("~/.music_converter")
+DEEZER_TOKEN_PATH = os.path.join(APP_DATA_DIR, "deezer.json")
+CONVERSION_CACHE_PATH = os.path.join(APP_DATA_DIR, "cache.sqlite")
+SPOTIFY_TOKEN_PATH = os.path.join(APP_DATA_DIR, "spotify_token.json")
+
+# Un morceau introuvable sur Deezer est recherché à nouveau après 1 jour
+TRACK_MAP_MISS_TTL = 24 * 3600
+
+# Un token qui expire dans moins de 5 minutes est considéré comme expiré
+TOKEN_EXPIRY_MARGIN = 300
+
+# Cache des recherches : taille en mémoire et durée de validité (30 jours)
+SEARCH_CACHE_PATH = os.path.join(APP_DATA_DIR, "search_cache")
+SEARCH_CACHE_SIZE = 4096
+SEARCH_CACHE_TTL = 30 * 24 * 3600
+
+# Limite de l'API Deezer : 50 requêtes toutes les 5 secondes
+DEEZER_MAX_CALLS = 50
+DEEZER_PERIOD = 5.0
+
+# Code d'erreur Deezer "aucune donnée" (ex: ISRC inconnu)
+DEEZER_ERROR_NOT_FOUND = 800
+
+# Code d'erreur Deezer d'un token OAuth invalide ou expiré
+DEEZER_ERROR_INVALID_TOKEN = 300
+
+class RateLimiter:
+    def __init__(self, max_calls: int, period: float):
+        """
+        Limiteur de débit partagé entre threads
+        
+        Args:
+            max_calls: Nombre maximum d'appels autorisés sur la période
+            period: Durée de la période en secondes
+        """
+        self.interval = period / max_calls
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+    
+    def wait(self):
+        """Bloque jusqu'au prochain créneau d'appel disponible"""
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+def match_playlist_url(url: str) -> Optional[Tuple[str, str]]:
+    """
+    Analyse une URL de playlist sans appel réseau
+    
+    Returns:
+        ('spotify', ID), ('deezer', ID) ou ('deezer_short', lien court à suivre),
+        ou None si l'URL n'est pas reconnue
+    """
+    match = _URL_RE.match(url)
+    if match is None:
+        return None
+    # Chaque alternative du motif contient un seul groupe nommé
+    return match.lastgroup, match.group(match.lastgroup)
+
+@dataclass
+class Track:
+    """Morceau lu depuis une playlist source (Spotify ou Deezer)"""
+    __slots__ = ('title', 'artist', 'album', 'duration', 'src_id', 'isrc')
+    
+    title: str
+    artist: str
+    album: str
+    duration: int
+    src_id: str
+    isrc: Optional[str]
+
+def best_match_index(query: str, candidates: List[str]) -> int:
+    """
+    Choisit le résultat de recherche le plus proche de la requête
+    
+    Args:
+        query: Requête "artiste titre" nettoyée
+        candidates: Résultats au format "artiste titre"
+    
+    Returns:
+        Index du meilleur candidat, ou 0 si aucun n'atteint MATCH_SCORE_CUTOFF
+    """
+    best = process.extractOne(
+        query, candidates,
+        scorer=fuzz.token_set_ratio,
+        processor=utils.default_process,
+        score_cutoff=MATCH_SCORE_CUTOFF
+    )
+    return best[2] if best else 0
+
+def _strip_accents(text: str) -> str:
+    """Retire les accents ("Beyoncé" → "Beyonce")"""
+    return ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+
+def search_cache_key(platform: str, title: str, artist: str) -> str:
+    """
+    Construit la clé de cache d'une recherche
+    
+    Args:
+        platform: Plateforme recherchée ('deezer' ou 'spotify')
+        title: Titre du morceau
+        artist: Artiste du morceau
+    
+    Returns:
+        Clé normalisée (sans ponctuation, casse, accents ni mention "feat."),
+        pour qu'une même chanson écrite différemment ne soit recherchée qu'une fois
+    """
+    clean_title = _CLEAN_RE.sub('', _strip_accents(_FEAT_RE.sub('', title))).lower().strip()
+    clean_artist = _CLEAN_RE.sub('', _strip_accents(artist)).lower().strip()
+    return f"{platform}|{clean_artist}|{clean_title}"
+
+class SearchCache:
+    def __init__(self, path: str = SEARCH_CACHE_PATH, maxsize: int = SEARCH_CACHE_SIZE, ttl: float = SEARCH_CACHE_TTL):
+        """
+        Cache des résultats de recherche, en mémoire (LRU) et sur disque (shelve)
+        
+        Args:
+            path: Fichier de persistance entre les exécutions
+            maxsize: Nombre maximum d'entrées gardées en mémoire
+            ttl: Durée de validité d'une entrée en secondes
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.memory: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+        
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.shelf = shelve.open(path)
+        except Exception as e:
+            print(f"⚠️  Cache de recherche sur disque indisponible: {e}")
+            self.shelf = None
+        
+        atexit.register(self.close)
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Retourne le résultat en cache, ou None s'il est absent ou expiré"""
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is None and self.shelf is not None:
+                entry = self.shelf.get(key)
+            
+            if entry is None:
+                return None
+            
+            stored_at, result = entry
+            if time.time() - stored_at > self.ttl:
+                # Entrée périmée : sera rafraîchie par la prochaine recherche
+                self.memory.pop(key, None)
+                return None
+            
+            self._remember(key, entry)
+            return result
+    
+    def set(self, key: str, result: Dict):
+        """Enregistre un résultat en mémoire et sur disque"""
+        entry = (time.time(), result)
+        with self.lock:
+            self._remember(key, entry)
+            if self.shelf is not None:
+                self.shelf[key] = entry
+    
+    def _remember(self, key: str, entry: Tuple[float, Dict]):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+    
+    def close(self):
+        """Ferme le fichier de cache"""
+        with self.lock:
+            if self.shelf is not None:
+                self.shelf.close()
+                self.shelf = None
+
+# Authentifications Deezer en cours, par app_id : les appels concurrents
+# attendent le résultat de la première au lieu d'en relancer une
+_auth_inflight: Dict[str, Future] = {}
+_auth_inflight_lock = threading.Lock()
+
+class ConversionCache:
+    def __init__(self, path: str = CONVERSION_CACHE_PATH, miss_ttl: float = TRACK_MAP_MISS_TTL):
+        """
+        Cache SQLite des conversions : correspondances Spotify → Deezer déjà
+        établies et contenu des playlists Spotify par snapshot_id
+        
+        Args:
+            path: Fichier de la base SQLite
+            miss_ttl: Durée de validité d'un résultat "introuvable" en secondes
+        """
+        self.miss_ttl = miss_ttl
+        self.lock = threading.Lock()
+        
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS track_map ("
+                "spotify_id TEXT PRIMARY KEY, isrc TEXT, deezer_id INTEGER, "
+                "title TEXT, artist TEXT, ts INTEGER)"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS track_map_isrc ON track_map (isrc)")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS playlist_snapshots ("
+                "playlist_id TEXT PRIMARY KEY, snapshot_id TEXT, tracks_json BLOB)"
+            )
+            self.db.commit()
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️  Cache des correspondances indisponible: {e}")
+            self.db = None
+        
+        atexit.register(self.close)
+    
+    def get_match(self, spotify_id: str, isrc: Optional[str]) -> Tuple[bool, Optional[Dict]]:
+        """
+        Cherche une correspondance connue par ID Spotify ou par ISRC
+        
+        Returns:
+            (trouvé dans le cache, morceau Deezer ou None si introuvable sur Deezer)
+        """
+        if self.db is None:
+            return False, None
+        
+        with self.lock:
+            row = self.db.execute(
+                "SELECT deezer_id, title, artist, ts FROM track_map "
+                "WHERE spotify_id = ? OR isrc = ? "
+                "ORDER BY deezer_id IS NOT NULL DESC, spotify_id = ? DESC LIMIT 1",
+                (spotify_id, isrc, spotify_id)
+            ).fetchone()
+        
+        if row is None:
+            return False, None
+        
+        deezer_id, title, artist, ts = row
+        if deezer_id is None:
+            # Résultat négatif : n'est conservé que peu de temps
+            return time.time() - ts <= self.miss_ttl, None
+        
+        return True, {'id': deezer_id, 'title': title, 'artist': artist}
+    
+    def set_match(self, spotify_id: str, isrc: Optional[str], match: Optional[Dict]):
+        """Enregistre la correspondance trouvée (ou son absence)"""
+        if self.db is None:
+            return
+        
+        values = (
+            spotify_id, isrc,
+            match['id'] if match else None,
+            match['title'] if match else None,
+            match['artist'] if match else None,
+            int(time.time())
+        )
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO track_map VALUES (?, ?, ?, ?, ?, ?)", values)
+            self.db.commit()
+    
+    def get_playlist(self, playlist_id: str, snapshot_id: str) -> Optional[List[Track]]:
+        """Retourne les morceaux enregistrés si la playlist n'a pas changé depuis"""
+        if self.db is None:
+            return None
+        
+        with self.lock:
+            row = self.db.execute(
+                "SELECT tracks_json FROM playlist_snapshots WHERE playlist_id = ? AND snapshot_id = ?",
+                (playlist_id, snapshot_id)
+            ).fetchone()
+        
+        if row is None:
+            return None
+        return [Track(**track) for track in orjson.loads(row[0])]
+    
+    def set_playlist(self, playlist_id: str, snapshot_id: str, tracks: List[Track]):
+        """Enregistre les morceaux d'une playlist pour son snapshot_id courant"""
+        if self.db is None:
+            return
+        
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO playlist_snapshots VALUES (?, ?, ?)",
+                (playlist_id, snapshot_id, orjson.dumps(tracks))
+            )
+            self.db.commit()
+    
+    def close(self):
+        """Ferme la base SQLite"""
+        with self.lock:
+            if self.db is not None:
+                self.db.close()
+                self.db = None
+
+def create_http_session() -> requests.Session:
+    """
+    Crée une session HTTP avec pool de connexions keep-alive
+    
+    Returns:
+        Session requests réutilisant les connexions TCP/TLS entre les appels
+    """
+    session = requests.Session()
+    # Attend seulement quand l'API le demande (429 + Retry-After) ou en cas d'erreur serveur
+    retry = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True
+    )
+    # Un pool par hôte (api.deezer.com, api.spotify.com, ...), 32 connexions chacun
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+    session.mount("https://", adapter)
+    return session
+
+class _DeezerCallbackHandler:
+    def __init__(self):
+        """
+        Gestionnaire de connexion du serveur local de callback Deezer
+        
+        Le premier callback reçu résout `self.code` avec le code
+        d'autorisation (ou None si Deezer a renvoyé une erreur).
+        """
+        self.code: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.writers: Set[asyncio.StreamWriter] = set()
+    
+    async def __call__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.writers.add(writer)
+        try:
+            await self._handle(reader, writer)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError,
+                ConnectionError, asyncio.CancelledError):
+            # Connexion inactive, interrompue ou fermée à l'arrêt du serveur
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+    
+    def close_clients(self):
+        """Ferme les connexions encore ouvertes pour que le serveur puisse s'arrêter"""
+        for writer in list(self.writers):
+            writer.close()
+    
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=CALLBACK_READ_TIMEOUT)
+        
+        # Ligne de requête : "GET /deezer_callback?code=... HTTP/1.1"
+        request_line = request.split(b"\r\n", 1)[0].decode('latin-1').split(' ')
+        path = request_line[1] if len(request_line) > 1 else ''
+        is_callback = path.startswith('/deezer_callback')
+        code = None
+        
+        if is_callback:
+            # Parse l'URL pour extraire le code d'autorisation
+            query_params = parse_qs(urlparse(path).query)
+            
+            if 'code' in query_params:
+                code = query_params['code'][0]
+                status = "200 OK"
+                body = CALLBACK_SUCCESS_PAGE
+            else:
+                status = "400 Bad Request"
+                error = query_params.get('error_reason', ['Unknown error'])[0]
+                body = f'<h2>Erreur: {error}</h2>'.encode()
+        else:
+            status = "404 Not Found"
+            body = b''
+        
+        writer.write(
+            f"HTTP/1.1 {status}\r\n"
+            f"Content-Type: text/html\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+        
+        if is_callback and not self.code.done():
+            self.code.set_result(code)
+
 class DeezerOAuth:
     def __init__(self, app_id: str, app_secret: str, redirect_uri: str = "http://localhost:8080/deezer_callback"):
         """
@@ -43,6 +543,9 @@ class DeezerOAuth:
         self.redirect_uri = redirect_uri
         self.access_token: Optional[str] = None
         self.authorization_code: Optional[str] = None
+        self.user_id: Optional[int] = None
+        self.expires_at: Optional[float] = None
+        self.http = create_http_session()
         
     def get_auth_url(self, perms: str = "basic_access,email,offline_access,manage_library") -> str:
         """
@@ -74,79 +577,49 @@ class DeezerOAuth:
         Returns:
             True si l'authentification réussit, False sinon
         """
-        # Démarre le serveur local pour écouter le callback
-        callback_received = threading.Event()
-        
-        class CallbackHandler(http.server.SimpleHTTPRequestHandler):
-            def do_GET(self):
-                if self.path.startswith('/deezer_callback'):
-                    # Parse l'URL pour extraire le code d'autorisation
-                    parsed_url = urlparse(self.path)
-                    query_params = parse_qs(parsed_url.query)
-                    
-                    if 'code' in query_params:
-                        outer_self.authorization_code = query_params['code'][0]
-                        self.send_response(200)
-                        self.send_header('Content-type', 'text/html')
-                        self.end_headers()
-                        self.wfile.write(b'''
-                        <html>
-                            <body>
-                                <h2>Authentification reussie!</h2>
-                                <p>Vous pouvez fermer cette fenetre.</p>
-                                <script>window.close();</script>
-                            </body>
-                        </html>
-                        ''')
-                    else:
-                        self.send_response(400)
-                        self.send_header('Content-type', 'text/html')
-                        self.end_headers()
-                        error = query_params.get('error_reason', ['Unknown error'])[0]
-                        self.wfile.write(f'<h2>Erreur: {error}</h2>'.encode())
-                    
-                    callback_received.set()
-                else:
-                    self.send_response(404)
-                    self.end_headers()
-            
-            def log_message(self, format, *args):
-                pass  # Supprime les logs du serveur
-        
-        outer_self = self
-        
-        # Démarre le serveur local
+        # Démarre le serveur local et attend le callback (timeout de 5 minutes)
         try:
-            with socketserver.TCPServer(("", 8080), CallbackHandler) as httpd:
-                server_thread = threading.Thread(target=httpd.serve_forever)
-                server_thread.daemon = True
-                server_thread.start()
-                
-                # Ouvre l'URL d'authentification dans le navigateur
-                auth_url = self.get_auth_url(perms)
-                print(f"🌐 Ouverture du navigateur pour l'authentification...")
-                print(f"URL: {auth_url}")
-                webbrowser.open(auth_url)
-                
-                # Attend le callback (timeout de 5 minutes)
-                if callback_received.wait(timeout=300):
-                    httpd.shutdown()
-                    
-                    if self.authorization_code:
-                        # Échange le code contre un access token
-                        return self.exchange_code_for_token()
-                    else:
-                        print("❌ Aucun code d'autorisation reçu")
-                        return False
-                else:
-                    httpd.shutdown()
-                    print("❌ Timeout - Authentification non terminée")
-                    return False
-                    
+            self.authorization_code = asyncio.run(self._wait_for_callback(perms, timeout=300))
+        except asyncio.TimeoutError:
+            print("❌ Timeout - Authentification non terminée")
+            return False
         except OSError as e:
             print(f"❌ Erreur serveur local: {e}")
             print("💡 Assurez-vous que le port 8080 est libre")
             return False
+        
+        if self.authorization_code:
+            # Échange le code contre un access token
+            return self.exchange_code_for_token()
+        else:
+            print("❌ Aucun code d'autorisation reçu")
+            return False
+    
+    async def _wait_for_callback(self, perms: str, timeout: float) -> Optional[str]:
+        """
+        Écoute sur le port 8080 le temps de recevoir un seul callback Deezer
+        
+        Returns:
+            Code d'autorisation reçu, ou None si Deezer a renvoyé une erreur
+        
+        Raises:
+            asyncio.TimeoutError: si aucun callback n'arrive avant le timeout
+        """
+        handler = _DeezerCallbackHandler()
+        
+        server = await asyncio.start_server(handler, host='', port=8080)
+        async with server:
+            # Ouvre l'URL d'authentification dans le navigateur
+            auth_url = self.get_auth_url(perms)
+            print(f"🌐 Ouverture du navigateur pour l'authentification...")
+            print(f"URL: {auth_url}")
+            webbrowser.open(auth_url)
+            
+            try:
+                return await asyncio.wait_for(handler.code, timeout=timeout)
+            finally:
+                # Sans cela, la sortie du contexte attend les connexions inactives du navigateur
+                handler.close_clients()
     
     def exchange_code_for_token(self) -> bool:
         """
@@ -166,7 +639,7 @@ class DeezerOAuth:
         }
         
         try:
-            response = requests.get(DEEZER_TOKEN_URL, params=params)
+            response = self.http.get(DEEZER_TOKEN_URL, params=params)
             
             if response.status_code == 200:
                 # La réponse contient access_token=TOKEN&expires=TIME
@@ -174,7 +647,9 @@ class DeezerOAuth:
                 
                 if 'access_token' in response_data:
                     self.access_token = response_data['access_token'][0]
-                    expires_in = response_data.get('expires', ['3600'])[0]
+                    expires_in = int(response_data.get('expires', ['3600'])[0])
+                    # expires=0 : token sans expiration (permission offline_access)
+                    self.expires_at = time.time() + expires_in if expires_in > 0 else None
                     print(f"✅ Access token obtenu! (expire dans {expires_in}s)")
                     
                     # Test de la connexion
@@ -202,13 +677,14 @@ class DeezerOAuth:
             return False
         
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{DEEZER_BASE_URL}/user/me",
                 params={'access_token': self.access_token}
             )
             
             if response.status_code == 200:
-                user_data = response.json()
+                user_data = orjson.loads(response.content)
+                self.user_id = user_data.get('id')
                 print(f"✅ Connexion Deezer réussie! Bonjour {user_data.get('name', 'Utilisateur')}")
                 print(f"📧 Email: {user_data.get('email', 'Non disponible')}")
                 print(f"🌍 Pays: {user_data.get('country', 'Non disponible')}")
@@ -222,273 +698,618 @@ class DeezerOAuth:
             return False
 
 class PlaylistConverter:
-    def __init__(self):
+    def __init__(self, verbose: bool = False):
         self.spotify = None
+        self.spotify_user_id = None
+        self.verbose = verbose
         self.deezer_access_token = None
+        self.deezer_token_expires_at: Optional[float] = None
+        self.deezer_user_id = None
         self.deezer_oauth = None
-        self.setup_spotify()
+        self.http = create_http_session()
+        self.http.headers.update({'Accept': 'application/json'})
+        self.deezer_limiter = RateLimiter(DEEZER_MAX_CALLS, DEEZER_PERIOD)
+        self.search_cache = SearchCache()
+        self.conversion_cache = ConversionCache()
+        self.short_links: Dict[str, str] = {}
     
     def setup_spotify(self):
         """Configure l'authentification Spotify"""
+        # Import différé : spotipy n'est chargé que si Spotify est utilisé
+        import spotipy
+        from spotipy.oauth2 import SpotifyOAuth
+        from spotipy.cache_handler import CacheFileHandler
+        
+        settings = load_config()
         try:
+            # Emplacement fixe : le token est retrouvé quel que soit le dossier de lancement
+            os.makedirs(APP_DATA_DIR, exist_ok=True)
             auth_manager = SpotifyOAuth(
-                client_id=SPOTIFY_CLIENT_ID,
-                client_secret=SPOTIFY_CLIENT_SECRET,
-                redirect_uri=SPOTIFY_REDIRECT_URI,
-                scope=SPOTIFY_SCOPE,
-                cache_path=".spotify_cache"
+                client_id=settings.spotify_client_id,
+                client_secret=settings.spotify_client_secret,
+                redirect_uri=settings.spotify_redirect_uri,
+                scope=settings.spotify_scope,
+                cache_handler=CacheFileHandler(cache_path=SPOTIFY_TOKEN_PATH),
+                requests_session=self.http
             )
-            self.spotify = spotipy.Spotify(auth_manager=auth_manager)
+            # Les appels Spotify réutilisent les connexions keep-alive de la session
+            spotify = spotipy.Spotify(auth_manager=auth_manager, requests_session=self.http)
+            # Premier appel : rafraîchit le token si besoin avant toute opération,
+            # et l'ID utilisateur récupéré une seule fois évite un appel /me par playlist
+            self.spotify_user_id = spotify.current_user()['id']
+            self.spotify = spotify
             print("✅ Connexion Spotify réussie!")
         except Exception as e:
             print(f"❌ Erreur connexion Spotify: {e}")
     
-    def setup_deezer(self, access_token: str):
+    def setup_deezer(self, access_token: str, expires_at: Optional[float] = None, persist: bool = True):
         """Configure l'authentification Deezer"""
-        self.deezer_access_token = access_token
         # Test de la connexion
         try:
-            response = requests.get(f"{DEEZER_BASE_URL}/user/me?access_token={access_token}")
-            if response.status_code == 200:
-                user_data = response.json()
-                print(f"✅ Connexion Deezer réussie! Bonjour {user_data.get('name', 'Utilisateur')}")
-                return True
-            else:
-                print("❌ Token Deezer invalide")
-                return False
+            user_data = self._fetch_deezer_user(access_token)
         except Exception as e:
             print(f"❌ Erreur connexion Deezer: {e}")
             return False
+        
+        if user_data is None:
+            print("❌ Token Deezer invalide")
+            return False
+        
+        self._use_deezer_token(access_token, expires_at, user_data)
+        if persist:
+            self.save_deezer_token()
+        return True
+    
+    def _fetch_deezer_user(self, access_token: str) -> Optional[Dict]:
+        """
+        Récupère le profil Deezer associé au token
+        
+        Returns:
+            Profil de l'utilisateur, ou None si Deezer refuse le token
+            
+        Raises:
+            requests.RequestException: Erreur réseau ou autre erreur de l'API
+        """
+        response = self.http.get(f"{DEEZER_BASE_URL}/user/me", params={'access_token': access_token})
+        if response.status_code != 200:
+            return None
+        
+        # Deezer répond 200 avec un objet "error" : code 300 si le token est invalide ou expiré
+        user_data = orjson.loads(response.content)
+        if 'error' in user_data:
+            if user_data['error'].get('code') == DEEZER_ERROR_INVALID_TOKEN:
+                return None
+            raise requests.HTTPError(f"Deezer: {user_data['error'].get('message')}")
+        return user_data
+    
+    def _use_deezer_token(self, access_token: str, expires_at: Optional[float], user_data: Dict):
+        """Adopte un token Deezer dont la validité vient d'être vérifiée"""
+        self.deezer_access_token = access_token
+        self.deezer_token_expires_at = expires_at
+        self.deezer_user_id = user_data.get('id')
+        print(f"✅ Connexion Deezer réussie! Bonjour {user_data.get('name', 'Utilisateur')}")
     
     def setup_deezer_oauth(self):
         """Configure l'authentification Deezer OAuth automatique"""
-        if DEEZER_APP_ID == "YOUR_DEEZER_APP_ID" or DEEZER_APP_SECRET == "YOUR_DEEZER_APP_SECRET":
+        settings = load_config()
+        if settings.deezer_app_id == "YOUR_DEEZER_APP_ID" or settings.deezer_app_secret == "YOUR_DEEZER_APP_SECRET":
             print("❌ Veuillez configurer DEEZER_APP_ID et DEEZER_APP_SECRET dans le code")
             print("💡 Créez une app sur https://developers.deezer.com/")
             return False
         
-        self.deezer_oauth = DeezerOAuth(DEEZER_APP_ID, DEEZER_APP_SECRET)
+        with _auth_inflight_lock:
+            inflight = _auth_inflight.get(settings.deezer_app_id)
+            if inflight is None:
+                future = Future()
+                _auth_inflight[settings.deezer_app_id] = future
+        
+        if inflight is not None:
+            print("⏳ Authentification Deezer déjà en cours, en attente...")
+            try:
+                oauth = inflight.result()
+            except Exception as e:
+                # L'erreur est déjà remontée à l'appelant qui a lancé l'authentification
+                print(f"❌ Erreur authentification Deezer: {e}")
+                return False
+            if oauth is None:
+                return False
+            self._use_deezer_oauth(oauth)
+            return True
+        
+        try:
+            oauth = self._run_deezer_oauth()
+            future.set_result(oauth)
+            return oauth is not None
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with _auth_inflight_lock:
+                del _auth_inflight[settings.deezer_app_id]
+    
+    def _run_deezer_oauth(self) -> Optional[DeezerOAuth]:
+        """Déroule le flux OAuth Deezer et enregistre le token obtenu"""
+        settings = load_config()
+        oauth = DeezerOAuth(settings.deezer_app_id, settings.deezer_app_secret)
         
         print("🔄 Démarrage de l'authentification Deezer...")
-        success = self.deezer_oauth.start_auth_flow()
+        success = oauth.start_auth_flow()
         
-        if success and self.deezer_oauth.access_token:
-            self.deezer_access_token = self.deezer_oauth.access_token
-            return True
+        if success and oauth.access_token:
+            self._use_deezer_oauth(oauth)
+            self.save_deezer_token()
+            return oauth
         else:
             print("❌ Échec de l'authentification Deezer")
+            return None
+    
+    def _use_deezer_oauth(self, oauth: DeezerOAuth):
+        """Adopte le token obtenu par un flux OAuth Deezer"""
+        self.deezer_oauth = oauth
+        self.deezer_access_token = oauth.access_token
+        self.deezer_token_expires_at = oauth.expires_at
+        self.deezer_user_id = oauth.user_id
+    
+    def save_deezer_token(self):
+        """Enregistre le token Deezer pour les prochaines exécutions"""
+        try:
+            os.makedirs(APP_DATA_DIR, exist_ok=True)
+            # Créé directement en 0600 : le token n'est jamais lisible par les autres utilisateurs
+            fd = os.open(DEEZER_TOKEN_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(orjson.dumps({
+                    'access_token': self.deezer_access_token,
+                    'expires_at': self.deezer_token_expires_at
+                }))
+        except OSError as e:
+            print(f"⚠️  Impossible d'enregistrer le token Deezer: {e}")
+    
+    def ensure_deezer_token(self) -> bool:
+        """
+        Restaure le token Deezer enregistré lors d'une exécution précédente
+        
+        Deezer ne fournit pas de refresh token : un token expiré (ou sur le
+        point de l'être) est abandonné et l'option 5 permet d'en obtenir un
+        nouveau.
+        
+        Returns:
+            True si un token valide est disponible, False sinon
+        """
+        try:
+            with open(DEEZER_TOKEN_PATH, 'rb') as f:
+                saved = orjson.loads(f.read())
+        except FileNotFoundError:
+            return False
+        except (OSError, orjson.JSONDecodeError) as e:
+            print(f"⚠️  Token Deezer enregistré illisible: {e}")
+            return False
+        
+        access_token = saved.get('access_token')
+        expires_at = saved.get('expires_at')
+        if not access_token:
             return False
+        
+        if expires_at is not None and expires_at - time.time() < TOKEN_EXPIRY_MARGIN:
+            print("⚠️  Token Deezer expiré - utilisez l'option 5 pour vous reconnecter")
+            self._forget_deezer_token()
+            return False
+        
+        try:
+            user_data = self._fetch_deezer_user(access_token)
+        except Exception as e:
+            # Erreur passagère : le token est conservé pour le prochain démarrage
+            print(f"⚠️  Vérification du token Deezer impossible: {e}")
+            return False
+        
+        if user_data is None:
+            # Token révoqué (ou saisi à l'option 4 sans date d'expiration) : oublié
+            print("⚠️  Token Deezer refusé - utilisez l'option 4 ou 5 pour vous reconnecter")
+            self._forget_deezer_token()
+            return False
+        
+        self._use_deezer_token(access_token, expires_at, user_data)
+        return True
+    
+    def _forget_deezer_token(self):
+        """Supprime le token Deezer enregistré, devenu inutilisable"""
+        try:
+            os.remove(DEEZER_TOKEN_PATH)
+        except OSError:
+            pass
+    
+    def ensure_spotify_token(self) -> bool:
+        """
+        Rafraîchit au démarrage la connexion Spotify si un token est enregistré
+        
+        Sans token enregistré, la connexion (interactive) est reportée à la
+        première option qui utilise Spotify : les options Deezer n'en ont pas besoin.
+        
+        Returns:
+            True si Spotify est connecté, False sinon
+        """
+        if os.path.exists(SPOTIFY_TOKEN_PATH):
+            self.setup_spotify()
+        return self.spotify is not None
+    
+    def require_spotify(self) -> bool:
+        """Connecte Spotify à la première utilisation (True si la connexion est établie)"""
+        if self.spotify is None:
+            self.setup_spotify()
+        return self.spotify is not None
     
     def get_deezer_auth_url(self) -> str:
         """Génère l'URL d'authentification Deezer (méthode manuelle)"""
         params = {
-            'app_id': DEEZER_APP_ID,
+            'app_id': load_config().deezer_app_id,
             'redirect_uri': 'http://localhost:8080/deezer_callback',
             'perms': 'basic_access,email,offline_access,manage_library,manage_community,delete_library'
         }
         return f"https://connect.deezer.com/oauth/auth.php?{urlencode(params)}"
     
-    def parse_spotify_playlist_url(self, url: str) -> Optional[str]:
-        """Extrait l'ID de playlist depuis une URL Spotify"""
-        try:
-            # Formats supportés:
-            # https://open.spotify.com/playlist/37i9dAZF1DXcBZIGnYBM5M
-            # spotify:playlist:37i9dAZF1DXcBZIGnYBM5M
-            
-            if url.startswith('spotify:playlist:'):
-                return url.split(':')[-1]
-            
-            parsed = urlparse(url)
-            if 'spotify.com' in parsed.netloc and '/playlist/' in parsed.path:
-                playlist_id = parsed.path.split('/playlist/')[-1].split('?')[0]
-                return playlist_id
+    def parse_playlist_url(self, url: str) -> Optional[Tuple[str, str]]:
+        """
+        Identifie la plateforme et l'ID d'une URL de playlist
+        
+        Args:
+            url: URL Spotify ou Deezer (les liens courts Deezer sont suivis)
             
-            return None
-        except Exception as e:
-            print(f"❌ Erreur analyse URL Spotify: {e}")
-            return None
+        Returns:
+            ('spotify' ou 'deezer', ID de la playlist), ou None si l'URL n'est pas reconnue
+        """
+        parsed = match_playlist_url(url)
+        if parsed is not None and parsed[0] == 'deezer_short':
+            final_url = self._resolve_short_link(url)
+            parsed = match_playlist_url(final_url) if final_url else None
+            if parsed is not None and parsed[0] == 'deezer_short':
+                parsed = None
+        return parsed
     
-    def parse_deezer_playlist_url(self, url: str) -> Optional[str]:
-        """Extrait l'ID de playlist depuis une URL Deezer"""
+    def _resolve_short_link(self, url: str) -> Optional[str]:
+        """Suit la redirection d'un lien court Deezer (résultat mis en cache)"""
+        if url in self.short_links:
+            return self.short_links[url]
+        
         try:
-            # Formats supportés:
-            # https://www.deezer.com/playlist/1234567890
-            # https://deezer.com/fr/playlist/1234567890
-            # https://link.deezer.com/s/shortcode (liens courts)
-            
-            parsed = urlparse(url)
-            
-            # Gestion des liens courts Deezer
-            if 'link.deezer.com' in parsed.netloc:
-                # Suit la redirection pour obtenir l'URL complète
-                try:
-                    response = requests.head(url, allow_redirects=True)
-                    if response.status_code == 200:
-                        final_url = response.url
-                        return self.parse_deezer_playlist_url(final_url)
-                except:
-                    pass
-            
-            # Gestion des URLs standards
-            if 'deezer.com' in parsed.netloc and '/playlist/' in parsed.path:
-                playlist_id = parsed.path.split('/playlist/')[-1].split('?')[0]
-                return playlist_id
-            
+            response = self.http.head(url, allow_redirects=True, timeout=SHORT_LINK_TIMEOUT)
+        except requests.RequestException as e:
+            print(f"❌ Lien court Deezer injoignable: {e}")
             return None
-        except Exception as e:
-            print(f"❌ Erreur analyse URL Deezer: {e}")
+        
+        if response.status_code != 200:
             return None
+        
+        self.short_links[url] = response.url
+        return response.url
     
-    def get_deezer_playlist_tracks(self, playlist_id: str) -> List[Dict]:
+    def get_deezer_playlist_tracks(self, playlist_id: str) -> List[Track]:
         """Récupère les morceaux d'une playlist Deezer publique avec pagination"""
         try:
-            tracks = []
             url = f"{DEEZER_BASE_URL}/playlist/{playlist_id}/tracks"
             
-            while url:
-                response = requests.get(url)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    for track in data.get('data', []):
-                        tracks.append({
-                            'title': track['title'],
-                            'artist': track['artist']['name'],
-                            'album': track['album']['title'],
-                            'duration': track['duration'],
-                            'deezer_id': track['id']
-                        })
-                    
-                    # Pagination - continue avec l'URL suivante
-                    url = data.get('next')
-                    if url:
-                        print(f"📋 Récupération de {len(tracks)} morceaux...")
+            self.deezer_limiter.wait()
+            response = self.http.get(url, params={'index': 0, 'limit': PAGE_SIZE})
+            
+            if response.status_code == 403:
+                print("❌ Playlist Deezer privée ou accès refusé")
+                return []
+            elif response.status_code == 404:
+                print("❌ Playlist Deezer introuvable")
+                return []
+            elif response.status_code != 200:
+                print(f"❌ Erreur accès playlist Deezer: {response.status_code}")
+                return []
+            
+            data = orjson.loads(response.content)
+            if 'error' in data:
+                # Deezer répond 200 avec un objet "error" (quota dépassé, playlist inconnue, etc.)
+                print(f"❌ Erreur accès playlist Deezer: {data['error'].get('message')}")
+                return []
+            pages = [data]
+            total = data.get('total')
+            
+            if total is not None:
+                # Le total est connu : les pages suivantes partent en parallèle
+                if total > PAGE_SIZE:
+                    print(f"📋 Récupération de {total} morceaux...")
+                indexes = range(PAGE_SIZE, total, PAGE_SIZE)
+                with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as executor:
+                    more_pages = list(executor.map(lambda index: self._get_deezer_tracks_page(url, index), indexes))
                 
-                elif response.status_code == 403:
-                    print("❌ Playlist Deezer privée ou accès refusé")
-                    return []
-                elif response.status_code == 404:
-                    print("❌ Playlist Deezer introuvable")
+                # Une page manquante tronquerait la playlist : la conversion est abandonnée
+                failed = [index for index, page in zip(indexes, more_pages) if page is None]
+                if failed:
+                    print(f"❌ Pages Deezer non récupérées (index {', '.join(map(str, failed))}), conversion annulée")
                     return []
-                else:
-                    print(f"❌ Erreur accès playlist Deezer: {response.status_code}")
-                    break
+                pages.extend(more_pages)
+            else:
+                # Pagination séquentielle - continue avec l'URL suivante
+                next_url = data.get('next')
+                while next_url:
+                    self.deezer_limiter.wait()
+                    response = self.http.get(next_url)
+                    if response.status_code != 200:
+                        print(f"❌ Erreur accès playlist Deezer: {response.status_code}, conversion annulée")
+                        return []
+                    
+                    data = orjson.loads(response.content)
+                    if 'error' in data:
+                        print(f"❌ Erreur accès playlist Deezer: {data['error'].get('message')}, conversion annulée")
+                        return []
+                    pages.append(data)
+                    next_url = data.get('next')
+            
+            tracks = []
+            append = tracks.append
+            for page in pages:
+                for track in page.get('data', []):
+                    append(Track(
+                        title=track['title'],
+                        artist=track['artist']['name'],
+                        album=track['album']['title'],
+                        duration=track['duration'],
+                        src_id=str(track['id']),
+                        isrc=None  # absent des morceaux renvoyés par /playlist/{id}/tracks
+                    ))
             
             return tracks
         except Exception as e:
             print(f"❌ Erreur récupération morceaux Deezer: {e}")
             return []
     
+    def _get_deezer_tracks_page(self, url: str, index: int) -> Optional[Dict]:
+        """Récupère une page de morceaux Deezer à partir de l'index donné (None en cas d'erreur)"""
+        try:
+            self.deezer_limiter.wait()
+            response = self.http.get(url, params={'index': index, 'limit': PAGE_SIZE})
+            if response.status_code != 200:
+                print(f"❌ Erreur accès playlist Deezer (index {index}): {response.status_code}")
+                return None
+            
+            data = orjson.loads(response.content)
+            if 'error' in data:
+                # Erreur renvoyée avec un statut 200 : la page n'est pas exploitable
+                print(f"❌ Erreur accès playlist Deezer (index {index}): {data['error'].get('message')}")
+                return None
+            return data
+        except Exception as e:
+            print(f"❌ Erreur accès playlist Deezer (index {index}): {e}")
+            return None
+    
+    def _spotify_get_json(self, url: str, params: Optional[Dict] = None) -> Dict:
+        """
+        Appel GET à l'API Spotify sans passer par spotipy, décodé avec orjson
+        
+        Args:
+            url: URL complète de l'API (ex: curseur 'next' d'une page)
+            params: Paramètres de requête
+            
+        Returns:
+            Réponse JSON décodée
+        """
+        auth_manager = self.spotify.auth_manager
+        # Le token est relu à chaque page (mis en cache par spotipy, rafraîchi s'il expire) ;
+        # les 429 sont gérés par la politique de relance de la session
+        token = auth_manager.get_access_token(as_dict=False)
+        response = self.http.get(url, params=params, headers={'Authorization': f"Bearer {token}"})
+        
+        if response.status_code == 401:
+            # Token révoqué ou expiré entre-temps : un rafraîchissement puis une seule relance
+            token_info = auth_manager.cache_handler.get_cached_token()
+            token = auth_manager.refresh_access_token(token_info['refresh_token'])['access_token']
+            response = self.http.get(url, params=params, headers={'Authorization': f"Bearer {token}"})
+        
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
     def get_spotify_playlists(self) -> List[Dict]:
         """Récupère toutes les playlists Spotify de l'utilisateur"""
         if not self.spotify:
             return []
         
         try:
+            results = self.spotify.current_user_playlists(limit=PLAYLISTS_PAGE_SIZE)
+            pages = [results]
+            total = results.get('total')
+            
+            if total is not None:
+                # Le total est connu : les pages suivantes partent en parallèle
+                with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as executor:
+                    pages.extend(executor.map(
+                        lambda offset: self.spotify.current_user_playlists(limit=PLAYLISTS_PAGE_SIZE, offset=offset),
+                        range(PLAYLISTS_PAGE_SIZE, total, PLAYLISTS_PAGE_SIZE)
+                    ))
+            
+            # Suit le curseur depuis la dernière page : couvre l'absence de total
+            # et les playlists créées pendant la récupération, sans rien tronquer
+            results = pages[-1]
+            while results['next']:
+                results = self.spotify.next(results)
+                pages.append(results)
+            
             playlists = []
-            results = self.spotify.current_user_playlists(limit=50)
-            
-            while results:
-                for playlist in results['items']:
-                    if playlist['owner']['id'] == self.spotify.current_user()['id']:
-                        playlists.append({
-                            'id': playlist['id'],
-                            'name': playlist['name'],
-                            'description': playlist['description'],
-                            'tracks_total': playlist['tracks']['total']
-                        })
-                
-                if results['next']:
-                    results = self.spotify.next(results)
-                else:
-                    break
+            append = playlists.append
+            user_id = self.spotify_user_id
+            for page in pages:
+                for playlist in page['items']:
+                    if playlist['owner']['id'] != user_id:
+                        continue
+                    append({
+                        'id': playlist['id'],
+                        'name': playlist['name'],
+                        'tracks_total': playlist['tracks']['total']
+                    })
             
             return playlists
         except Exception as e:
             print(f"❌ Erreur récupération playlists Spotify: {e}")
             return []
     
-    def get_spotify_playlist_tracks(self, playlist_id: str) -> List[Dict]:
-        """Récupère les morceaux d'une playlist Spotify"""
+    def get_spotify_playlist_tracks(self, playlist_id: str) -> List[Track]:
+        """Récupère les morceaux d'une playlist Spotify (réutilisés si elle n'a pas changé)"""
         if not self.spotify:
             return []
         
+        # Le snapshot_id ne change que si le contenu de la playlist change
         try:
-            tracks = []
-            results = self.spotify.playlist_tracks(playlist_id)
-            
-            while results:
-                for item in results['items']:
-                    if item['track'] and item['track']['type'] == 'track':
-                        track = item['track']
-                        artists = [artist['name'] for artist in track['artists']]
-                        tracks.append({
-                            'title': track['name'],
-                            'artist': artists[0] if artists else '',
-                            'artists': artists,
-                            'album': track['album']['name'],
-                            'duration': track['duration_ms'] // 1000,
-                            'spotify_id': track['id']
-                        })
-                
-                if results['next']:
-                    results = self.spotify.next(results)
-                else:
-                    break
-            
-            return tracks
+            snapshot_id = self.spotify.playlist(playlist_id, fields="snapshot_id")['snapshot_id']
         except Exception as e:
-            print(f"❌ Erreur récupération morceaux Spotify: {e}")
+            print(f"❌ Erreur récupération playlist Spotify: {e}")
             return []
+        
+        tracks = self.conversion_cache.get_playlist(playlist_id, snapshot_id)
+        if tracks is not None:
+            return tracks
+        
+        tracks = self._fetch_spotify_playlist_tracks(playlist_id)
+        if tracks:
+            self.conversion_cache.set_playlist(playlist_id, snapshot_id, tracks)
+        return tracks
     
-    def search_deezer_track(self, title: str, artist: str) -> Optional[Dict]:
-        """Recherche un morceau sur Deezer"""
+    def _fetch_spotify_playlist_tracks(self, playlist_id: str) -> List[Track]:
+        """Récupère les morceaux d'une playlist Spotify via l'API"""
+        
         try:
-            # Nettoie les titres pour une meilleure recherche
-            clean_title = re.sub(r'[^\w\s]', '', title)
-            clean_artist = re.sub(r'[^\w\s]', '', artist)
+            # Ne demande que les champs utilisés pour réduire la taille des réponses
+            def get_page(offset: int) -> Dict:
+                return self._spotify_get_json(
+                    f"{SPOTIFY_API_URL}/playlists/{playlist_id}/tracks",
+                    {
+                        'fields': "items(track(id,name,type,artists(name),album(name),duration_ms,external_ids(isrc))),next,total",
+                        'additional_types': "track",
+                        'market': "from_token",
+                        'limit': PAGE_SIZE,
+                        'offset': offset
+                    }
+                )
             
-            query = f"{clean_artist} {clean_title}".strip()
+            results = get_page(0)
+            pages = [results]
+            total = results.get('total')
             
-            response = requests.get(
-                f"{DEEZER_BASE_URL}/search",
-                params={'q': query, 'limit': 5}
-            )
+            if total is not None:
+                # Le total est connu : les pages suivantes partent en parallèle
+                with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as executor:
+                    pages.extend(executor.map(get_page, range(PAGE_SIZE, total, PAGE_SIZE)))
             
-            if response.status_code == 200:
-                data = response.json()
-                
-                if data.get('data'):
-                    # Trouve la meilleure correspondance
-                    for track in data['data']:
-                        track_title = track['title'].lower()
-                        track_artist = track['artist']['name'].lower()
-                        
-                        if (clean_title.lower() in track_title or track_title in clean_title.lower()) and \
-                           (clean_artist.lower() in track_artist or track_artist in clean_artist.lower()):
-                            return {
-                                'id': track['id'],
-                                'title': track['title'],
-                                'artist': track['artist']['name'],
-                                'album': track['album']['title'],
-                                'duration': track['duration']
-                            }
+            # Suit le curseur depuis la dernière page : couvre l'absence de total
+            # et les morceaux ajoutés pendant la récupération
+            results = pages[-1]
+            while results['next']:
+                results = self._spotify_get_json(results['next'])
+                pages.append(results)
+            
+            tracks = []
+            append = tracks.append
+            for page in pages:
+                for item in page['items']:
+                    track = item['track']
+                    if not track or track.get('type') != 'track':
+                        continue
                     
-                    # Si pas de correspondance exacte, prend le premier résultat
-                    track = data['data'][0]
-                    return {
-                        'id': track['id'],
-                        'title': track['title'],
-                        'artist': track['artist']['name'],
-                        'album': track['album']['title'],
-                        'duration': track['duration']
-                    }
+                    artists = track['artists']
+                    append(Track(
+                        title=track['name'],
+                        artist=artists[0]['name'] if artists else '',
+                        album=track['album']['name'],
+                        duration=track['duration_ms'] // 1000,
+                        src_id=track['id'],
+                        isrc=(track.get('external_ids') or {}).get('isrc')
+                    ))
             
-            return None
+            return tracks
         except Exception as e:
-            print(f"❌ Erreur recherche Deezer pour '{title}' - '{artist}': {e}")
+            print(f"❌ Erreur récupération morceaux Spotify: {e}")
+            return []
+    
+    def search_deezer_track(self, title: str, artist: str) -> Optional[Dict]:
+        """
+        Recherche un morceau sur Deezer (avec cache)
+        
+        Returns:
+            Morceau trouvé, ou None si la recherche ne donne aucun résultat
+            
+        Raises:
+            requests.RequestException: Erreur réseau ou réponse d'erreur de l'API
+        """
+        key = search_cache_key('deezer', title, artist)
+        result = self.search_cache.get(key)
+        if result is None:
+            result = self._search_deezer_track_api(title, artist)
+            if result:
+                self.search_cache.set(key, result)
+        return result
+    
+    def _search_deezer_track_api(self, title: str, artist: str) -> Optional[Dict]:
+        """Recherche un morceau via l'API Deezer (les erreurs sont propagées)"""
+        # Nettoie les titres pour une meilleure recherche
+        clean_title = _CLEAN_RE.sub('', title)
+        clean_artist = _CLEAN_RE.sub('', artist)
+        
+        query = f"{clean_artist} {clean_title}".strip()
+        
+        self.deezer_limiter.wait()
+        response = self.http.get(
+            f"{DEEZER_BASE_URL}/search",
+            params={'q': query, 'limit': 5}
+        )
+        response.raise_for_status()
+        
+        data = orjson.loads(response.content)
+        if 'error' in data:
+            # Deezer répond 200 avec un objet "error" (quota dépassé, etc.)
+            raise requests.HTTPError(f"Deezer: {data['error'].get('message')}")
+        
+        if not data.get('data'):
             return None
+        
+        # Trouve la meilleure correspondance (insensible à l'ordre des mots)
+        # Si pas de correspondance suffisante, prend le premier résultat
+        candidates = [f"{t['artist']['name']} {t['title']}" for t in data['data']]
+        track = data['data'][best_match_index(query, candidates)]
+        return {
+            'id': track['id'],
+            'title': track['title'],
+            'artist': track['artist']['name'],
+            'album': track['album']['title'],
+            'duration': track['duration']
+        }
+    
+    def search_deezer_by_isrc(self, isrc: str) -> Optional[Dict]:
+        """
+        Recherche un morceau Deezer par code ISRC (correspondance exacte, avec cache)
+        
+        Returns:
+            Morceau trouvé, ou None si l'ISRC est inconnu de Deezer
+            
+        Raises:
+            requests.RequestException: Erreur réseau ou réponse d'erreur de l'API
+        """
+        key = f"deezer-isrc|{isrc}"
+        result = self.search_cache.get(key)
+        if result is not None:
+            return result
+        
+        self.deezer_limiter.wait()
+        response = self.http.get(f"{DEEZER_BASE_URL}/track/isrc:{isrc}")
+        response.raise_for_status()
+        
+        # Deezer répond 200 avec un objet "error" : code 800 si l'ISRC est inconnu,
+        # autre code pour une vraie erreur (quota dépassé, etc.)
+        track = orjson.loads(response.content)
+        if 'error' in track:
+            if track['error'].get('code') == DEEZER_ERROR_NOT_FOUND:
+                return None
+            raise requests.HTTPError(f"Deezer: {track['error'].get('message')}")
+        
+        result = {
+            'id': track['id'],
+            'title': track['title'],
+            'artist': track['artist']['name'],
+            'album': track['album']['title'],
+            'duration': track['duration']
+        }
+        self.search_cache.set(key, result)
+        return result
     
     def create_deezer_playlist(self, name: str, track_ids: List[int]) -> bool:
         """Crée une playlist sur Deezer"""
@@ -498,8 +1319,8 @@ class PlaylistConverter:
         
         try:
             # Crée la playlist
-            response = requests.post(
-                f"{DEEZER_BASE_URL}/user/me/playlists",
+            response = self.http.post(
+                f"{DEEZER_BASE_URL}/user/{self.deezer_user_id or 'me'}/playlists",
                 data={
                     'title': name,
                     'access_token': self.deezer_access_token
@@ -507,26 +1328,28 @@ class PlaylistConverter:
             )
             
             if response.status_code == 200:
-                playlist_data = response.json()
+                playlist_data = orjson.loads(response.content)
                 playlist_id = playlist_data.get('id')
                 
                 if playlist_id and track_ids:
-                    # Ajoute les morceaux à la playlist
-                    tracks_str = ','.join(map(str, track_ids))
-                    add_response = requests.post(
-                        f"{DEEZER_BASE_URL}/playlist/{playlist_id}/tracks",
-                        data={
-                            'songs': tracks_str,
-                            'access_token': self.deezer_access_token
-                        }
-                    )
+                    # Ajoute les morceaux par lots pour éviter les requêtes tronquées ;
+                    # les lots restent séquentiels pour conserver l'ordre de la playlist
+                    for i in range(0, len(track_ids), DEEZER_ADD_BATCH):
+                        batch = [str(track_id) for track_id in track_ids[i:i + DEEZER_ADD_BATCH]]
+                        add_response = self.http.post(
+                            f"{DEEZER_BASE_URL}/playlist/{playlist_id}/tracks",
+                            data={
+                                'songs': ','.join(batch),
+                                'access_token': self.deezer_access_token
+                            }
+                        )
+                        
+                        if add_response.status_code != 200:
+                            print(f"❌ Erreur ajout morceaux à la playlist Deezer ({i} morceaux ajoutés)")
+                            return False
                     
-                    if add_response.status_code == 200:
-                        print(f"✅ Playlist '{name}' créée sur Deezer avec {len(track_ids)} morceaux")
-                        return True
-                    else:
-                        print(f"❌ Erreur ajout morceaux à la playlist Deezer")
-                        return False
+                    print(f"✅ Playlist '{name}' créée sur Deezer avec {len(track_ids)} morceaux")
+                    return True
                 else:
                     print(f"✅ Playlist '{name}' créée sur Deezer (vide)")
                     return True
@@ -538,35 +1361,36 @@ class PlaylistConverter:
             return False
     
     def search_spotify_track(self, title: str, artist: str) -> Optional[Dict]:
-        """Recherche un morceau sur Spotify"""
+        """Recherche un morceau sur Spotify (avec cache)"""
+        key = search_cache_key('spotify', title, artist)
+        result = self.search_cache.get(key)
+        if result is None:
+            result = self._search_spotify_track_api(title, artist)
+            if result:
+                self.search_cache.set(key, result)
+        return result
+    
+    def _search_spotify_track_api(self, title: str, artist: str) -> Optional[Dict]:
+        """Recherche un morceau via l'API Spotify"""
         if not self.spotify:
             return None
         
         try:
-            clean_title = re.sub(r'[^\w\s]', '', title)
-            clean_artist = re.sub(r'[^\w\s]', '', artist)
+            clean_title = _CLEAN_RE.sub('', title)
+            clean_artist = _CLEAN_RE.sub('', artist)
             
             query = f"track:{clean_title} artist:{clean_artist}"
             
             results = self.spotify.search(q=query, type='track', limit=5)
             
-            if results['tracks']['items']:
-                for track in results['tracks']['items']:
-                    track_title = track['name'].lower()
-                    track_artists = [a['name'].lower() for a in track['artists']]
-                    
-                    if (clean_title.lower() in track_title or track_title in clean_title.lower()) and \
-                       any(clean_artist.lower() in ta or ta in clean_artist.lower() for ta in track_artists):
-                        return {
-                            'id': track['id'],
-                            'title': track['name'],
-                            'artists': [a['name'] for a in track['artists']],
-                            'album': track['album']['name'],
-                            'duration': track['duration_ms'] // 1000
-                        }
-                
-                # Si pas de correspondance exacte, prend le premier résultat
-                track = results['tracks']['items'][0]
+            items = results['tracks']['items']
+            if items:
+                # Trouve la meilleure correspondance (insensible à l'ordre des mots)
+                # Si pas de correspondance suffisante, prend le premier résultat
+                candidates = [
+                    f"{' '.join(a['name'] for a in t['artists'])} {t['name']}" for t in items
+                ]
+                track = items[best_match_index(f"{clean_artist} {clean_title}", candidates)]
                 return {
                     'id': track['id'],
                     'title': track['name'],
@@ -586,15 +1410,16 @@ class PlaylistConverter:
             return False
         
         try:
-            user_id = self.spotify.current_user()['id']
             playlist = self.spotify.user_playlist_create(
-                user=user_id,
+                user=self.spotify_user_id,
                 name=name,
                 public=False
             )
             
             if track_ids:
-                # Spotify limite à 100 morceaux par requête
+                # Spotify limite à 100 morceaux par requête. Les lots restent
+                # séquentiels : envoyés en parallèle, ils seraient ajoutés dans
+                # leur ordre d'arrivée et mélangeraient la playlist.
                 for i in range(0, len(track_ids), 100):
                     batch = track_ids[i:i+100]
                     self.spotify.playlist_add_items(playlist['id'], batch)
@@ -605,6 +1430,17 @@ class PlaylistConverter:
             print(f"❌ Erreur création playlist Spotify: {e}")
             return False
     
+    def _print_progress(self, done: int, total: int):
+        """Met à jour la ligne de progression de la recherche"""
+        if done % PROGRESS_EVERY == 0 or done == total:
+            end = "\n" if done == total else ""
+            print(f"\r🔍 Recherche: {done}/{total} morceaux", end=end, flush=True)
+    
+    @staticmethod
+    def _deezer_match_key(track: Track) -> Tuple[Optional[str], str]:
+        """Clé de déduplication d'un morceau à rechercher sur Deezer"""
+        return track.isrc, search_cache_key('deezer', track.title, track.artist)
+    
     def convert_spotify_to_deezer(self, spotify_playlist_id: str, new_playlist_name: str = None):
         """Convertit une playlist Spotify vers Deezer"""
         print("🔄 Conversion Spotify → Deezer en cours...")
@@ -620,19 +1456,53 @@ class PlaylistConverter:
         # Recherche les morceaux sur Deezer
         found_tracks = []
         not_found = []
+        details = []
         
-        for i, track in enumerate(tracks, 1):
-            print(f"🔍 ({i}/{len(tracks)}) Recherche: {track['artist']} - {track['title']}")
+        # Un même morceau n'est recherché qu'une fois, même s'il apparaît plusieurs fois
+        unique_tracks = {}
+        for track in tracks:
+            unique_tracks.setdefault(self._deezer_match_key(track), track)
+        
+        def find_track(track: Track) -> Optional[Dict]:
+            # Correspondance déjà établie lors d'une conversion précédente
+            cached, match = self.conversion_cache.get_match(track.src_id, track.isrc)
+            if cached:
+                return match
+            
+            # Correspondance exacte par ISRC, recherche textuelle sinon
+            try:
+                match = self.search_deezer_by_isrc(track.isrc) if track.isrc else None
+                match = match or self.search_deezer_track(track.title, track.artist)
+            except Exception as e:
+                # Erreur passagère : rien n'est enregistré, le morceau sera recherché à nouveau
+                print(f"❌ Erreur recherche Deezer pour '{track.title}' - '{track.artist}': {e}")
+                return None
             
-            deezer_track = self.search_deezer_track(track['title'], track['artist'])
+            # Absence confirmée par une recherche réussie : enregistrée comme résultat négatif
+            self.conversion_cache.set_match(track.src_id, track.isrc, match)
+            return match
+        
+        # Les recherches partent en parallèle, les résultats arrivent dans l'ordre
+        matches = {}
+        with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as executor:
+            results = executor.map(find_track, unique_tracks.values())
+            for i, (key, deezer_track) in enumerate(zip(unique_tracks, results), 1):
+                matches[key] = deezer_track
+                self._print_progress(i, len(unique_tracks))
+        
+        for track in tracks:
+            deezer_track = matches[self._deezer_match_key(track)]
             if deezer_track:
                 found_tracks.append(deezer_track['id'])
-                print(f"  ✅ Trouvé: {deezer_track['artist']} - {deezer_track['title']}")
+                if self.verbose:
+                    details.append(f"  ✅ {track.artist} - {track.title} → {deezer_track['artist']} - {deezer_track['title']}")
             else:
-                not_found.append(f"{track['artist']} - {track['title']}")
-                print(f"  ❌ Non trouvé")
-            
-            time.sleep(0.1)  # Évite le rate limiting
+                not_found.append(f"{track.artist} - {track.title}")
+                if self.verbose:
+                    details.append(f"  ❌ {track.artist} - {track.title}")
+        
+        if details:
+            print("\n".join(details))
         
         # Crée la playlist Deezer
         if not new_playlist_name:
@@ -667,19 +1537,28 @@ class PlaylistConverter:
         # Recherche les morceaux sur Spotify
         found_tracks = []
         not_found = []
+        details = []
         
-        for i, track in enumerate(tracks, 1):
-            print(f"🔍 ({i}/{len(tracks)}) Recherche: {track['artist']} - {track['title']}")
-            
-            spotify_track = self.search_spotify_track(track['title'], track['artist'])
-            if spotify_track:
-                found_tracks.append(spotify_track['id'])
-                print(f"  ✅ Trouvé: {spotify_track['artists'][0]} - {spotify_track['title']}")
-            else:
-                not_found.append(f"{track['artist']} - {track['title']}")
-                print(f"  ❌ Non trouvé")
+        # Les morceaux des playlists Deezer n'ont pas d'ISRC : recherche textuelle
+        # (un appel /track/{id} par morceau doublerait les appels soumis au quota Deezer)
+        # Les recherches partent en parallèle, les résultats arrivent dans l'ordre
+        with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as executor:
+            results = executor.map(lambda t: self.search_spotify_track(t.title, t.artist), tracks)
             
-            time.sleep(0.1)  # Évite le rate limiting
+            for i, (track, spotify_track) in enumerate(zip(tracks, results), 1):
+                if spotify_track:
+                    found_tracks.append(spotify_track['id'])
+                    if self.verbose:
+                        details.append(f"  ✅ {track.artist} - {track.title} → {spotify_track['artists'][0]} - {spotify_track['title']}")
+                else:
+                    not_found.append(f"{track.artist} - {track.title}")
+                    if self.verbose:
+                        details.append(f"  ❌ {track.artist} - {track.title}")
+                
+                self._print_progress(i, len(tracks))
+        
+        if details:
+            print("\n".join(details))
         
         # Crée la playlist Spotify
         if not new_playlist_name:
@@ -702,112 +1581,205 @@ class PlaylistConverter:
     def convert_playlist_by_url(self, url: str, new_playlist_name: str = None):
         """Convertit une playlist en utilisant son URL"""
         # Détecte le type de plateforme
-        if 'spotify.com' in url or url.startswith('spotify:'):
-            # Conversion Spotify vers Deezer
-            playlist_id = self.parse_spotify_playlist_url(url)
-            if playlist_id:
-                print(f"🎵 Playlist Spotify détectée (ID: {playlist_id})")
-                self.convert_spotify_to_deezer(playlist_id, new_playlist_name)
-            else:
-                print("❌ URL Spotify invalide")
-        
-        elif 'deezer.com' in url:
-            # Conversion Deezer vers Spotify
-            playlist_id = self.parse_deezer_playlist_url(url)
-            if playlist_id:
-                print(f"🎵 Playlist Deezer détectée (ID: {playlist_id})")
-                self.convert_deezer_to_spotify(playlist_id, new_playlist_name)
-            else:
-                print("❌ URL Deezer invalide")
+        parsed = self.parse_playlist_url(url)
+        if parsed is None:
+            print("❌ URL non supportée. Utilisez une URL Spotify ou Deezer.")
+            return
         
+        service, playlist_id = parsed
+        if service == 'spotify':
+            # Conversion Spotify vers Deezer
+            print(f"🎵 Playlist Spotify détectée (ID: {playlist_id})")
+            self.convert_spotify_to_deezer(playlist_id, new_playlist_name)
         else:
-            print("❌ URL non supportée. Utilisez une URL Spotify ou Deezer.")
+            # Conversion Deezer vers Spotify
+            print(f"🎵 Playlist Deezer détectée (ID: {playlist_id})")
+            self.convert_deezer_to_spotify(playlist_id, new_playlist_name)
+
+# Menu principal, affiché en une seule écriture à chaque tour de boucle
+MENU_BANNER = (
+    "\n📋 Options disponibles:\n"
+    "1. Voir mes playlists Spotify (1r pour rafraîchir)\n"
+    "2. Convertir playlist Spotify → Deezer (2r pour rafraîchir, 2n pour saisir le nom)\n"
+    "3. Convertir playlist par lien URL\n"
+    "4. Configurer Deezer (token manuel)\n"
+    "5. Authentification Deezer automatique\n"
+    "6. Obtenir URL d'authentification Deezer\n"
+    "7. Quitter\n"
+)
+
+# Valeur renvoyée par une action du menu pour quitter la boucle principale
+QUIT = object()
 
 def main():
+    parser = argparse.ArgumentParser(description="Convertisseur de playlists Spotify ↔ Deezer")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="Affiche le détail de chaque morceau après la conversion")
+    args = parser.parse_args()
+    
     print("🎵 Convertisseur de Playlists Spotify ↔ Deezer")
     print("=" * 50)
     
-    converter = PlaylistConverter()
+    converter = PlaylistConverter(verbose=args.verbose)
     
-    while True:
-        print("\n📋 Options disponibles:")
-        print("1. Voir mes playlists Spotify")
-        print("2. Convertir playlist Spotify → Deezer")
-        print("3. Convertir playlist par lien URL")
-        print("4. Configurer Deezer (token manuel)")
-        print("5. Authentification Deezer automatique")
-        print("6. Obtenir URL d'authentification Deezer")
-        print("7. Quitter")
-        
-        choice = input("\n🎯 Votre choix (1-7): ").strip()
-        
-        if choice == "1":
-            print("\n🎵 Vos playlists Spotify:")
-            playlists = converter.get_spotify_playlists()
-            if playlists:
-                for i, playlist in enumerate(playlists, 1):
-                    print(f"{i:2d}. {playlist['name']} ({playlist['tracks_total']} morceaux)")
-            else:
-                print("❌ Aucune playlist trouvée")
-        
-        elif choice == "2":
-            playlists = converter.get_spotify_playlists()
-            if not playlists:
-                print("❌ Aucune playlist Spotify disponible")
-                continue
-            
-            print("\n🎵 Choisissez une playlist à convertir:")
-            for i, playlist in enumerate(playlists, 1):
-                print(f"{i:2d}. {playlist['name']} ({playlist['tracks_total']} morceaux)")
-            
-            try:
-                idx = int(input("\n🎯 Numéro de la playlist: ")) - 1
-                if 0 <= idx < len(playlists):
-                    selected = playlists[idx]
-                    new_name = input(f"📝 Nouveau nom (ou Entrée pour '{selected['name']}'): ").strip()
-                    if not new_name:
-                        new_name = selected['name']
-                    
-                    converter.convert_spotify_to_deezer(selected['id'], new_name)
-                else:
-                    print("❌ Numéro invalide")
-            except ValueError:
-                print("❌ Veuillez entrer un numéro valide")
-        
-        elif choice == "3":
-            url = input("🔗 Entrez l'URL de la playlist à convertir: ").strip()
-            if url:
-                new_name = input("📝 Nouveau nom de playlist (ou Entrée pour nom automatique): ").strip()
-                if not new_name:
-                    new_name = None
-                
-                converter.convert_playlist_by_url(url, new_name)
-            else:
-                print("❌ URL requise")
+    # Valide les tokens enregistrés avant d'afficher le menu
+    converter.ensure_deezer_token()
+    converter.ensure_spotify_token()
+    
+    # Les playlists Spotify changent rarement pendant une session
+    _playlists_cache = {"data": None, "ts": 0.0}
+    
+    _playlist_names: List[str] = []
+    
+    def _get_playlists(force: bool = False) -> List[Dict]:
+        if not converter.require_spotify():
+            return []
+        expired = time.time() - _playlists_cache["ts"] > PLAYLISTS_CACHE_TTL
+        if force or expired or _playlists_cache["data"] is None:
+            _playlists_cache["data"] = converter.get_spotify_playlists()
+            _playlists_cache["ts"] = time.time()
+            _playlist_names[:] = [p['name'] for p in _playlists_cache["data"]]
+        return _playlists_cache["data"]
+    
+    def _complete_playlist(text: str, state: int) -> Optional[str]:
+        matches = [n for n in _playlist_names if n.lower().startswith(text.lower())]
+        return matches[state] if state < len(matches) else None
+    
+    def _input_playlist_name(prompt: str) -> str:
+        if readline is None:
+            return input(prompt)
         
-        elif choice == "4":
-            token = input("🔑 Entrez votre token d'accès Deezer: ").strip()
-            if token:
-                converter.setup_deezer(token)
-            else:
-                print("❌ Token requis")
+        # Complétion limitée à cette saisie : les autres invites n'en ont pas
+        previous_completer = readline.get_completer()
+        previous_delims = readline.get_completer_delims()
+        # La ligne entière est complétée : les noms peuvent contenir des espaces
+        readline.set_completer(_complete_playlist)
+        readline.set_completer_delims('')
+        try:
+            return input(prompt)
+        finally:
+            readline.set_completer(previous_completer)
+            readline.set_completer_delims(previous_delims)
+    
+    if readline is not None:
+        if 'libedit' in (readline.__doc__ or ''):
+            readline.parse_and_bind("bind ^I rl_complete")
+        else:
+            readline.parse_and_bind("tab: complete")
+    
+    def _convert_selected(selected: Dict):
+        new_name = input(f"📝 Nouveau nom (ou Entrée pour '{selected['name']}'): ").strip()
+        if not new_name:
+            new_name = selected['name']
         
-        elif choice == "5":
-            print("\n🔄 Authentification Deezer automatique...")
-            converter.setup_deezer_oauth()
+        converter.convert_spotify_to_deezer(selected['id'], new_name)
+    
+    def _print_playlists(playlists: List[Dict]):
+        # Une seule écriture pour toute la liste, même avec des centaines de playlists
+        sys.stdout.write("\n".join(
+            f"{i:2d}. {p['name']} ({p['tracks_total']} morceaux)" for i, p in enumerate(playlists, 1)
+        ) + "\n")
+        sys.stdout.flush()
+    
+    def _list_playlists(refresh: bool = False):
+        print("\n🎵 Vos playlists Spotify:")
+        playlists = _get_playlists(force=refresh)
+        if playlists:
+            _print_playlists(playlists)
+        else:
+            print("❌ Aucune playlist trouvée")
+    
+    def _convert_by_number(refresh: bool = False):
+        playlists = _get_playlists(force=refresh)
+        if not playlists:
+            print("❌ Aucune playlist Spotify disponible")
+            return
         
-        elif choice == "6":
-            print("\n🔗 URL d'authentification Deezer:")
-            print("⚠️  Vous devez d'abord créer une app sur https://developers.deezer.com/")
-            print(converter.get_deezer_auth_url())
-            print("\n💡 Suivez le lien, autorisez l'app et copiez le token depuis l'URL de retour")
+        print("\n🎵 Choisissez une playlist à convertir:")
+        _print_playlists(playlists)
         
-        elif choice == "7":
-            print("👋 Au revoir!")
-            break
+        try:
+            idx = int(input("\n🎯 Numéro de la playlist: ")) - 1
+            if 0 <= idx < len(playlists):
+                _convert_selected(playlists[idx])
+            else:
+                print("❌ Numéro invalide")
+        except ValueError:
+            print("❌ Veuillez entrer un numéro valide")
+    
+    def _convert_by_name():
+        # Saisie directe du nom (complétion avec Tab), sans afficher la liste
+        playlists = _get_playlists()
+        if not playlists:
+            print("❌ Aucune playlist Spotify disponible")
+            return
         
+        name = _input_playlist_name("\n🎯 Nom de la playlist (Tab pour compléter): ").strip().lower()
+        selected = next((p for p in playlists if p['name'].lower() == name), None)
+        if selected:
+            _convert_selected(selected)
+        else:
+            print("❌ Playlist introuvable")
+    
+    def _convert_by_url():
+        url = input("🔗 Entrez l'URL de la playlist à convertir: ").strip()
+        if url and match_playlist_url(url) is None:
+            print("❌ URL non reconnue. Utilisez un lien de playlist Spotify ou Deezer.")
+        elif url:
+            new_name = input("📝 Nouveau nom de playlist (ou Entrée pour nom automatique): ").strip()
+            if not new_name:
+                new_name = None
+            
+            if converter.require_spotify():
+                converter.convert_playlist_by_url(url, new_name)
+        else:
+            print("❌ URL requise")
+    
+    def _setup_token():
+        token = input("🔑 Entrez votre token d'accès Deezer: ").strip()
+        if token:
+            converter.setup_deezer(token)
         else:
+            print("❌ Token requis")
+    
+    def _setup_oauth():
+        print("\n🔄 Authentification Deezer automatique...")
+        converter.setup_deezer_oauth()
+    
+    def _print_auth_url():
+        print("\n🔗 URL d'authentification Deezer:")
+        print("⚠️  Vous devez d'abord créer une app sur https://developers.deezer.com/")
+        print(converter.get_deezer_auth_url())
+        print("\n💡 Suivez le lien, autorisez l'app et copiez le token depuis l'URL de retour")
+    
+    def _quit():
+        print("👋 Au revoir!")
+        return QUIT
+    
+    # Suffixe "r" : recharge la liste des playlists au lieu du cache
+    handlers: Dict[str, Callable[[], Optional[object]]] = {
+        "1": _list_playlists,
+        "1r": lambda: _list_playlists(refresh=True),
+        "2": _convert_by_number,
+        "2r": lambda: _convert_by_number(refresh=True),
+        "2n": _convert_by_name,
+        "3": _convert_by_url,
+        "4": _setup_token,
+        "5": _setup_oauth,
+        "6": _print_auth_url,
+        "7": _quit,
+    }
+    
+    while True:
+        sys.stdout.write(MENU_BANNER)
+        
+        choice = input("\n🎯 Votre choix (1-7): ").strip().lower()
+        
+        handler = handlers.get(choice)
+        if handler is None:
             print("❌ Choix invalide")
+        elif handler() is QUIT:
+            break
 
 if __name__ == "__main__":
     main()
\ No newline at end of file